@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import contextlib
 import json
+import os
 import pickle
+import re
+import time
+import weakref
 from pathlib import Path
+from typing import Any, Iterable, Iterator
 
 import yaml
 
-from .core import Backend, Observation
+from .core import Backend, Observation, _code_hash_of
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Global state is isolated here:
 _ALL_BACKENDS: dict[str, type[Backend]] = {}
@@ -80,22 +91,274 @@ class JSONBackend(Backend):
     configuration of each observation must be JSON-serializable to
     use this backend.
 
+    Every observation is also appended to ``<root>/index.jsonl``, so that
+    all observations can be loaded by reading a single file. Install
+    ``digital-experiments[fast]`` (i.e. ``orjson``) to speed up loading.
+
     Select this backed using ``@experiment(backend="json")``.
     """
 
     def record(self, observation: Observation) -> None:
-        path = self.root / f"{observation.id}.json"
-        with open(path, "w") as f:
-            json.dump(observation._asdict(), f, indent=2)
+        self.record_many([observation])
+
+    def record_many(self, observations: list[Observation]) -> None:
+        lines = []
+        for observation in observations:
+            path = self.root / f"{observation.id}.json"
+            with open(path, "w") as f:
+                json.dump(observation._asdict(), f, indent=2)
+            lines.append(json.dumps(observation._asdict()) + "\n")
+        # append all new lines to the index in a single write
+        with open(self._index, "a") as f:
+            f.write("".join(lines))
 
     def load(self, id: str) -> Observation:
         path = self.root / f"{id}.json"
         with open(path) as f:
-            return Observation(**json.load(f))
+            return Observation(**_parse_json(f.read()))
 
     def all_ids(self) -> list[str]:
         return [path.stem for path in self.root.glob("*.json")]
 
+    def load_all(self) -> list[Observation]:
+        index_mtime = self._index_mtime()
+        file_mtimes = self._file_mtimes()
+        observations = {}
+        for id, line in self._index_lines():
+            observation = _parse_observation(line)
+            if observation is not None:
+                observations[id] = observation
+
+        # the individual files are the source of truth: use them for any
+        # observations that are missing from the index, or that have been
+        # modified (e.g. by hand) since the index was last written
+        stale = {
+            id
+            for id, mtime in file_mtimes.items()
+            if id not in observations or mtime > index_mtime
+        }
+        if stale or observations.keys() != file_mtimes.keys():
+            stale_ids = list(stale)
+            reloaded = dict(zip(stale_ids, self._load_many(stale_ids)))
+            observations = {
+                id: reloaded[id] if id in reloaded else observations[id]
+                for id in file_mtimes
+            }
+            # the index is only an optimisation: ignore failures to write
+            # it, e.g. on read-only storage
+            with contextlib.suppress(OSError):
+                self._write_index(observations.values())
+        return sorted(observations.values(), key=lambda obs: obs.id)
+
+    def load_for_code(self, code_hash: str) -> list[Observation]:
+        index_mtime = self._index_mtime()
+        file_mtimes = self._file_mtimes()
+
+        # only parse lines that could possibly match: those that contain
+        # the hash, or that pre-date code hashes being recorded
+        indexed_ids = set()
+        matches = {}
+        for id, line in self._index_lines():
+            indexed_ids.add(id)
+            matches.pop(id, None)
+            if code_hash not in line and '"code_hash"' in line:
+                continue
+            observation = _parse_observation(line)
+            if observation is None:
+                # fall back to a full (repairing) load
+                return super().load_for_code(code_hash)
+            if _code_hash_of(observation) == code_hash:
+                matches[id] = observation
+
+        if indexed_ids != file_mtimes.keys() or any(
+            mtime > index_mtime for mtime in file_mtimes.values()
+        ):
+            return super().load_for_code(code_hash)
+        return sorted(matches.values(), key=lambda obs: obs.id)
+
+    def _file_mtimes(self) -> dict[str, int]:
+        """map the id of every stored observation to its file's mtime"""
+
+        with os.scandir(self.root) as entries:
+            return {
+                entry.name[: -len(".json")]: entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.name.endswith(".json")
+                and not entry.name.startswith(".")
+                and entry.is_file()
+            }
+
+    def _index_mtime(self) -> int:
+        """the index's mtime, or -1 if it doesn't exist"""
+
+        try:
+            return self._index.stat().st_mtime_ns
+        except FileNotFoundError:
+            return -1
+
+    @property
+    def _index(self) -> Path:
+        return self.root / "index.jsonl"
+
+    def _index_lines(self) -> Iterator[tuple[str, str]]:
+        """
+        Iterate over ``(id, line)`` pairs in the index, where each line is
+        a JSON-serialized observation. Lines without a readable id
+        (e.g. those that are still being written) are skipped.
+        """
+
+        try:
+            with open(self._index) as f:
+                for line in f:
+                    if not line.startswith(_INDEX_PREFIX):
+                        continue
+                    try:
+                        # only decode the id: a JSON string that starts
+                        # immediately after the prefix
+                        id, _ = _DECODER.raw_decode(line, len(_INDEX_PREFIX))
+                    except ValueError:
+                        continue
+                    yield id, line
+        except FileNotFoundError:
+            return
+
+    def _write_index(self, observations: Iterable[Observation]) -> None:
+        # write to a temporary file first so that readers never
+        # see a partially written index
+        tmp = self.root / f"index.jsonl.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            for observation in observations:
+                f.write(json.dumps(observation._asdict()) + "\n")
+        tmp.replace(self._index)
+
+
+class BufferedBackend(Backend):
+    """
+    Wraps another backend, holding recorded observations in memory and
+    passing them on in batches. Use this to reduce the I/O overhead
+    of running many, very quick experiments.
+
+    Buffered observations are flushed to the wrapped backend once
+    ``max_size`` of them have accumulated, on the first call to
+    :meth:`record` more than ``interval`` seconds after the previous flush,
+    before any observations are read back, when this backend is garbage
+    collected, and when Python exits. Call :meth:`flush` to do this manually.
+    Observations are passed on using the wrapped backend's
+    :meth:`~digital_experiments.core.Backend.record_many` method.
+
+    .. warning::
+        Buffered observations are lost if the process crashes, or exits
+        without running exit handlers (e.g. via ``os._exit``, as
+        ``multiprocessing`` workers do). Call :meth:`flush` before such
+        processes finish.
+
+    Parameters
+    ----------
+    backend : Backend
+        The backend to wrap
+    max_size : int
+        The maximum number of observations to buffer. Defaults to 100.
+    interval : float
+        The maximum time (in seconds) between flushes. Defaults to 0.5.
+
+    Example
+    -------
+    .. code-block:: python
+
+        from digital_experiments import experiment
+        from digital_experiments.backends import BufferedBackend
+
+        @experiment
+        def example(x):
+            return x**2
+
+        example.backend = BufferedBackend(example.backend)
+    """
+
+    def __init__(
+        self, backend: Backend, max_size: int = 100, interval: float = 0.5
+    ):
+        super().__init__(backend.root)
+        self.backend = backend
+        self.max_size = max_size
+        self.interval = interval
+        self._buffer: list[Observation] = []
+        self._last_flush = time.monotonic()
+        # flush on garbage collection or exit, without keeping self alive
+        weakref.finalize(self, _flush_buffer, backend, self._buffer)
+
+    def record(self, observation: Observation) -> None:
+        self._buffer.append(observation)
+        if (
+            len(self._buffer) >= self.max_size
+            or time.monotonic() - self._last_flush > self.interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Pass all buffered observations to the wrapped backend"""
+
+        _flush_buffer(self.backend, self._buffer)
+        self._last_flush = time.monotonic()
+
+    def load(self, id: str) -> Observation:
+        self.flush()
+        return self.backend.load(id)
+
+    def all_ids(self) -> list[str]:
+        self.flush()
+        return self.backend.all_ids()
+
+    def load_all(self) -> list[Observation]:
+        self.flush()
+        return self.backend.load_all()
+
+    def load_for_code(self, code_hash: str) -> list[Observation]:
+        self.flush()
+        return self.backend.load_for_code(code_hash)
+
+    def artefacts(self, id: str) -> list[Path]:
+        return self.backend.artefacts(id)
+
+
+def _flush_buffer(backend: Backend, buffer: list[Observation]) -> None:
+    # only clear the buffer once its contents have been written: if writing
+    # fails, they are kept and retried on the next flush
+    if buffer:
+        backend.record_many(list(buffer))
+        buffer.clear()
+
+
+# index lines are written by json.dumps(observation._asdict()),
+# and hence always start with this prefix
+_INDEX_PREFIX = '{"id": '
+_DECODER = json.JSONDecoder()
+_LONG_NUMBER = re.compile(r"\d{19}")
+
+
+def _parse_observation(line: str) -> Observation | None:
+    """parse an index line, or return None if it is malformed"""
+
+    try:
+        return Observation(**_parse_json(line))
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_json(text: str) -> Any:
+    """parse `text` as JSON, using the (faster) orjson library if available"""
+
+    # orjson silently parses integers that don't fit into 64 bits as floats:
+    # leave any text that might contain them to the stdlib json module
+    if orjson is not None and _LONG_NUMBER.search(text) is None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN and Infinity values that
+            # the stdlib json module writes: fall through
+            pass
+    return json.loads(text)
+
 
 def str_presenter(dumper, data):
     """configures yaml for dumping multiline strings"""
@@ -6,17 +6,29 @@ import os
 import platform
 import subprocess
 import sys
-from datetime import datetime
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Callable, TypedDict
+from typing import Any, Callable, NamedTuple
 
 from .core import Callback, Observation
-from .util import artefact_location, source_code
-
-# Global state is isolated here:
-_RUNNING_IDS: list[str] = []
-_CURRENT_ROOT: list[Path] = []
-_TIMING_BLOCKS: list[dict[str, TimingBlock]] = []
+from .util import artefact_location, code_hash, source_code
+
+# Global state is isolated here. Each stack is held in a ContextVar so that
+# concurrently running experiments (threads, asyncio tasks) don't interfere.
+# Note that new threads start with an empty context: to use this state from
+# a thread started inside an experiment, run it in a copy of the current
+# context (see contextvars.copy_context)
+_RUNNING_IDS: ContextVar[tuple[str, ...]] = ContextVar(
+    "running_ids", default=()
+)
+_CURRENT_ROOT: ContextVar[tuple[Path, ...]] = ContextVar(
+    "current_root", default=()
+)
+_TIMED_RUNS: ContextVar[tuple[_TimedRun, ...]] = ContextVar(
+    "timed_runs", default=()
+)
 
 
 class GlobalStateNotifier(Callback):
@@ -29,12 +41,12 @@ class GlobalStateNotifier(Callback):
         self.root = root
 
     def start(self, id: str, config: dict[str, Any]):
-        _RUNNING_IDS.append(id)
-        _CURRENT_ROOT.append(self.root)
+        _RUNNING_IDS.set(_RUNNING_IDS.get() + (id,))
+        _CURRENT_ROOT.set(_CURRENT_ROOT.get() + (self.root,))
 
     def end(self, observation: Observation):
-        _RUNNING_IDS.pop()
-        _CURRENT_ROOT.pop()
+        _RUNNING_IDS.set(_RUNNING_IDS.get()[:-1])
+        _CURRENT_ROOT.set(_CURRENT_ROOT.get()[:-1])
 
 
 def current_id() -> str:
@@ -55,12 +67,13 @@ def current_id() -> str:
             example() # prints something like "2021-01-01_12:00:00.000000"
     """
 
-    if len(_RUNNING_IDS) == 0:
+    running_ids = _RUNNING_IDS.get()
+    if len(running_ids) == 0:
         raise RuntimeError(
             "No experiment running - this function only works "
             "inside an experiment context"
         )
-    return _RUNNING_IDS[-1]
+    return running_ids[-1]
 
 
 def current_dir() -> Path:
@@ -88,12 +101,13 @@ def current_dir() -> Path:
         example.artefacts(id) # returns [Path("<some>/<path>/<id>/results.txt")]
     """
 
-    if len(_CURRENT_ROOT) == 0:
+    current_roots = _CURRENT_ROOT.get()
+    if len(current_roots) == 0:
         raise RuntimeError(
             "No experiment running - this function only works "
             "inside an experiment context"
         )
-    root = _CURRENT_ROOT[-1]
+    root = current_roots[-1]
     id = current_id()
     dir = artefact_location(root, id)
     dir.mkdir(parents=True, exist_ok=True)
@@ -125,41 +139,60 @@ class CodeVersioning(Callback):
 
     def setup(self, function: Callable) -> None:
         self.code = source_code(function)
+        self.code_hash = code_hash(self.code)
 
     def end(self, observation: Observation):
         observation.metadata["code"] = self.code
+        observation.metadata["code_hash"] = self.code_hash
 
 
-class TimingBlock(TypedDict):
+class TimingBlock(NamedTuple):
     start: str
     end: str
     duration: float
 
 
-def _timing_block(start: datetime, end: datetime) -> TimingBlock:
+def _timing_block(start: datetime, start_ns: int) -> TimingBlock:
+    # the duration comes from the monotonic clock: the wall-clock end is
+    # derived from it rather than read again via datetime.now()
+    duration = (time.perf_counter_ns() - start_ns) / 1e9
+    end = start + timedelta(seconds=duration)
     return TimingBlock(
-        start=start.strftime("%Y-%m-%d %H:%M:%S"),
-        end=end.strftime("%Y-%m-%d %H:%M:%S"),
-        duration=(end - start).total_seconds(),
+        start=start.isoformat(sep=" ", timespec="seconds"),
+        end=end.isoformat(sep=" ", timespec="seconds"),
+        duration=duration,
     )
 
 
+class _TimedRun(NamedTuple):
+    start: datetime
+    start_ns: int
+    blocks: dict[str, TimingBlock]
+
+
 class Timing(Callback):
     """Responsible for timing (portions of) experiments"""
 
     def start(self, id: str, config: dict[str, Any]):
-        self.start_time = datetime.now()
-        _TIMING_BLOCKS.append({})
+        # the start time is kept in the (context-local) stack rather than on
+        # this instance, so that concurrent runs don't overwrite each other's
+        run = _TimedRun(datetime.now(), time.perf_counter_ns(), {})
+        _TIMED_RUNS.set(_TIMED_RUNS.get() + (run,))
 
     def end(self, observation: Observation):
-        total_time = _timing_block(self.start_time, datetime.now())
+        all_runs = _TIMED_RUNS.get()
+        start, start_ns, blocks = all_runs[-1]
+        _TIMED_RUNS.set(all_runs[:-1])
 
-        blocks = _TIMING_BLOCKS.pop()
+        total_time = _timing_block(start, start_ns)._asdict()
         if len(blocks) == 0:
             observation.metadata["timing"] = total_time
         else:
-            blocks["total"] = total_time
-            observation.metadata["timing"] = blocks
+            # blocks are only converted to (serializable) dicts here,
+            # when they are attached to the observation
+            timing = {name: block._asdict() for name, block in blocks.items()}
+            timing["total"] = total_time
+            observation.metadata["timing"] = timing
 
 
 @contextlib.contextmanager
@@ -198,16 +231,16 @@ def time_block(name: str):
         # }
     """
 
-    if len(_TIMING_BLOCKS) == 0:
+    all_runs = _TIMED_RUNS.get()
+    if len(all_runs) == 0:
         raise RuntimeError(
             "No experiment running - this function only works "
             "inside an experiment context"
         )
 
-    start = datetime.now()
+    start, start_ns = datetime.now(), time.perf_counter_ns()
     yield
-    end = datetime.now()
-    _TIMING_BLOCKS[-1][name] = _timing_block(start, end)
+    all_runs[-1].blocks[name] = _timing_block(start, start_ns)
 
 
 class Tee:
@@ -285,18 +318,59 @@ def _command_output(command: str) -> str:
 def _in_git_repo() -> bool:
     """Check if the current directory is inside a git repo"""
     try:
-        return _command_output("git rev-parse --is-inside-work-tree") == "true"
-    except subprocess.CalledProcessError:
+        from dulwich.errors import NotGitRepository
+        from dulwich.repo import Repo
+    except ImportError:
+        try:
+            output = _command_output("git rev-parse --is-inside-work-tree")
+            return output == "true"
+        except subprocess.CalledProcessError:
+            return False
+
+    try:
+        Repo.discover()
+    except NotGitRepository:
         return False
+    return True
 
 
 @functools.lru_cache
 def _git_information() -> dict[str, str]:
-    """Get information about the current git repo"""
+    """
+    Get information about the current git repo.
+
+    If ``dulwich`` is installed, this is read directly from the ``.git``
+    directory. Otherwise, we fall back to running ``git`` in a subprocess.
+    """
+    try:
+        from dulwich.repo import Repo
+    except ImportError:
+        return _git_information_from_subprocess()
+
+    repo = Repo.discover()
+    refs, commit = repo.refs.follow(b"HEAD")
+    branch = refs[-1].decode()
+    if branch.startswith("refs/heads/"):
+        branch = branch[len("refs/heads/") :]
+    try:
+        remote = repo.get_config().get((b"remote", b"origin"), b"url").decode()
+    except KeyError:
+        remote = ""
+
+    return {"branch": branch, "commit": commit.decode(), "remote": remote}
+
+
+def _git_information_from_subprocess() -> dict[str, str]:
+    """Get information about the current git repo using ``git`` directly"""
+    try:
+        remote = _command_output("git config --get remote.origin.url")
+    except subprocess.CalledProcessError:
+        remote = ""
+
     return {
         "branch": _command_output("git rev-parse --abbrev-ref HEAD"),
         "commit": _command_output("git rev-parse HEAD"),
-        "remote": _command_output("git config --get remote.origin.url"),
+        "remote": remote,
     }
 
 
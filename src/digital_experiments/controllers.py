@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import random
+from collections import deque
+from functools import partial
 from itertools import product
 from typing import Any, Callable, Iterable, Protocol, Sequence, Union
 
 from .core import Controller, Experiment
+from .util import config_key
 
 # TODO implement:
 # - an sklearn controller / bayeseopt controller
 # - an optuna controller
 
-__all__ = ["RandomSearch", "GridSearch"]
+__all__ = ["RandomSearch", "GridSearch", "LatinHypercubeSearch"]
 
 
 class RandomSearch(Controller):
@@ -52,21 +55,28 @@ class RandomSearch(Controller):
 
     def __init__(self, **dimensions: RandomSearch.RandomDimension):
         self.dimensions = dimensions
+        # resolve how to sample each dimension once, up front
+        self._drawers = {
+            name: _make_drawer(dim) for name, dim in dimensions.items()
+        }
 
     def suggest(self, experiment: Experiment) -> dict[str, Any]:
-        def choose(dim: RandomSearch.RandomDimension) -> Any:
-            if isinstance(dim, Sequence):
-                return random.choice(dim)
-            elif hasattr(dim, "rvs"):
-                return dim.rvs()
-            else:
-                raise TypeError(
-                    f"Invalid dimension type: {type(dim)}. Expected a "
-                    "sequence, scipy.stats distribution, or any object "
-                    "with an rvs method."
-                )
+        return {name: draw() for name, draw in self._drawers.items()}
+
 
-        return {name: choose(dim) for name, dim in self.dimensions.items()}
+def _make_drawer(dim: RandomSearch.RandomDimension) -> Callable[[], Any]:
+    """get a function that draws a single value from `dim`"""
+
+    if isinstance(dim, Sequence):
+        return partial(random.choice, dim)
+    elif hasattr(dim, "rvs"):
+        return dim.rvs
+    else:
+        raise TypeError(
+            f"Invalid dimension type: {type(dim)}. Expected a "
+            "sequence, scipy.stats distribution, or any object "
+            "with an rvs method."
+        )
 
 
 class GridSearch(Controller):
@@ -105,12 +115,14 @@ class GridSearch(Controller):
         self.dimensions = dimensions
 
     def suggest(self, experiment: Experiment) -> dict[str, Any] | None:
-        # get existing configs
-        configs = [obs.config for obs in experiment.observations()]
+        # get existing configs, grouped by key for quick lookup
+        tried: dict[str, list[dict[str, Any]]] = {}
+        for obs in experiment.observations():
+            tried.setdefault(config_key(obs.config), []).append(obs.config)
 
         # loop through grid and return first config that hasn't been tried
         for config in self._grid_iter():
-            if config not in configs:
+            if config not in tried.get(config_key(config), []):
                 return config
 
         # if all configs have been tried, return None
@@ -119,3 +131,106 @@ class GridSearch(Controller):
     def _grid_iter(self):
         for config in product(*self.dimensions.values()):
             yield dict(zip(self.dimensions.keys(), config))
+
+
+class LatinHypercubeSearch(Controller):
+    """
+    Controller that suggests experiments based on Latin hypercube sampling
+
+    Configurations are generated in batches of ``n``. Within each batch, the
+    range of every dimension is split into ``n`` equally likely intervals,
+    and exactly one configuration is drawn from each of them. This covers
+    the search space more evenly than :class:`RandomSearch`, while (unlike
+    :class:`GridSearch`) the number of configurations needed does not grow
+    exponentially with the number of dimensions.
+
+    Parameters
+    ----------
+    n: int
+        the number of configurations in each batch
+    dimensions: dict[str, Sequence | PPF]
+        a mapping from parameter names to dimensions. A dimension can be a
+        sequence of values, a scipy.stats distribution or any object with a
+        ppf (percent point function) method
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        from digital_experiments import experiment
+        from digital_experiments.controllers import LatinHypercubeSearch
+        from scipy.stats import uniform
+
+        @experiment
+        def example(a, b):
+            return (2 * a - 1) * b
+
+        LatinHypercubeSearch(10, a=uniform(-1, 1), b=[1, 2, 3]).control(
+            example, n=10
+        )
+    """
+
+    class PPF(Protocol):
+        """
+        A protocol for scipy.stats distributions, or any
+        object with a ppf method
+        """
+
+        ppf: Callable[[float], Any]
+
+    Dimension = Union[Sequence, PPF]
+
+    def __init__(self, n: int, /, **dimensions: LatinHypercubeSearch.Dimension):
+        if n < 1:
+            raise ValueError(f"Invalid batch size: {n}. Expected n >= 1.")
+
+        self.n = n
+        self.dimensions = dimensions
+        # resolve how to map quantiles onto each dimension once, up front
+        self._transforms = {
+            name: _make_transform(dim) for name, dim in dimensions.items()
+        }
+        self._queue: deque[dict[str, Any]] = deque()
+
+    def suggest(self, experiment: Experiment) -> dict[str, Any]:
+        if not self._queue:
+            self._queue.extend(self._batch())
+        return self._queue.popleft()
+
+    def _batch(self) -> list[dict[str, Any]]:
+        # for each dimension, randomly assign one of the n intervals to each
+        # configuration, and draw uniformly from within that interval
+        columns = {}
+        for name, transform in self._transforms.items():
+            intervals = random.sample(range(self.n), self.n)
+            columns[name] = [
+                transform((i + random.random()) / self.n) for i in intervals
+            ]
+
+        return [
+            {name: column[i] for name, column in columns.items()}
+            for i in range(self.n)
+        ]
+
+
+def _make_transform(
+    dim: LatinHypercubeSearch.Dimension,
+) -> Callable[[float], Any]:
+    """get a function that maps a quantile in [0, 1) onto `dim`"""
+
+    if isinstance(dim, Sequence):
+        return partial(_sequence_ppf, dim)
+    elif hasattr(dim, "ppf"):
+        return dim.ppf
+    else:
+        raise TypeError(
+            f"Invalid dimension type: {type(dim)}. Expected a "
+            "sequence, scipy.stats distribution, or any object "
+            "with a ppf method."
+        )
+
+
+def _sequence_ppf(dim: Sequence, q: float) -> Any:
+    # guard against floating point error pushing q * len(dim) up to len(dim)
+    return dim[min(int(q * len(dim)), len(dim) - 1)]
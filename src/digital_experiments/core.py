@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import inspect
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, NamedTuple
+from typing import Any, Callable, Hashable, Iterable, NamedTuple
 
-from .util import artefact_location, complete_config, source_code
+from .util import (
+    artefact_location,
+    bind_config,
+    code_hash,
+    config_key,
+    flatten,
+    generate_id,
+    source_code,
+)
 
 
 class Experiment:
@@ -32,19 +41,36 @@ class Experiment:
         self.backend = backend
         self.callbacks = callbacks
         self.cache = cache
+        self._code_hash = code_hash(source_code(function))
+        self._signature = inspect.signature(function)
+        # lazily built index of the ids of current-code observations,
+        # keyed by config
+        self._cache_index: dict[Hashable, list[str]] | None = None
 
     def __repr__(self):
         return f"Experiment({self.function.__name__})"
 
+    @property
+    def callbacks(self) -> tuple[Callback, ...]:
+        """The callbacks used by this experiment, in the order they start."""
+        return self._callbacks
+
+    @callbacks.setter
+    def callbacks(self, callbacks: Iterable[Callback]) -> None:
+        # stored as a tuple so that the reversed copy (used to end callbacks)
+        # can't get out of sync through in-place modification
+        self._callbacks = tuple(callbacks)
+        self._reversed_callbacks = self._callbacks[::-1]
+
     def __call__(self, *args, **kwargs):
-        id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
-        config = complete_config(self.function, args, kwargs)
+        id = generate_id()
+        config = bind_config(self._signature, args, kwargs)
         metadata = {}
 
         if self.cache:
-            for observation in self.observations(current_code_only=True):
-                if observation.config == config:
-                    return observation.result
+            previous = self._cached_observation(config)
+            if previous is not None:
+                return previous.result
 
         for callback in self.callbacks:
             callback.start(id, config)
@@ -52,12 +78,45 @@ class Experiment:
         result = self.function(*args, **kwargs)
 
         observation = Observation(id, config, result, metadata)
-        for callback in reversed(self.callbacks):
+        for callback in self._reversed_callbacks:
             callback.end(observation)
 
         self.backend.record(observation)
+        self._add_to_cache_index(observation)
         return result
 
+    def _cached_observation(self, config: dict[str, Any]) -> Observation | None:
+        """
+        Get a previous observation (from the current version of the code)
+        that used ``config``, or ``None`` if there isn't one.
+        """
+
+        if self._cache_index is None:
+            self._cache_index = {}
+            for observation in self.observations(current_code_only=True):
+                self._add_to_cache_index(observation)
+
+        # keys are not guaranteed to be unique, so check for true equality.
+        # Candidates are loaded from the backend so that the stored result is
+        # returned, rather than an object that may since have been mutated
+        ids = self._cache_index.get(config_key(config), [])
+        for id in list(ids):
+            try:
+                observation = self.backend.load(id)
+            except (FileNotFoundError, KeyError):
+                # deleted since the index was built: forget about it
+                ids.remove(id)
+                continue
+            if observation.config == config:
+                return observation
+        return None
+
+    def _add_to_cache_index(self, observation: Observation) -> None:
+        if self._cache_index is None:
+            return
+        key = config_key(observation.config)
+        self._cache_index.setdefault(key, []).append(observation.id)
+
     def observations(self, current_code_only: bool = True) -> list[Observation]:
         """
         Get a list of all previous observations of this experiment. By default,
@@ -85,14 +144,9 @@ class Experiment:
 
         """
 
-        observations = self.backend.load_all()
         if current_code_only:
-            observations = [
-                obs
-                for obs in observations
-                if obs.metadata.get("code") == source_code(self.function)
-            ]
-        return observations
+            return self.backend.load_for_code(self._code_hash)
+        return self.backend.load_all()
 
     def artefacts(self, id: str) -> list[Path]:
         """
@@ -183,12 +237,28 @@ class Experiment:
         if not observations:
             return pd.DataFrame()
 
-        dicts = [obs._asdict() for obs in observations]
-        if not include_metadata:
-            for d in dicts:
-                d.pop("metadata")
+        # build each (flattened) row in a single pass, without
+        # creating and then trimming a full copy of each observation
+        rows = []
+        key_cache: dict[tuple[str, str], str] = {}
+        for obs in observations:
+            row = {"id": obs.id, "config": obs.config, "result": obs.result}
+            if include_metadata:
+                row["metadata"] = obs.metadata
+            rows.append(flatten(row, normalising_sep, key_cache))
+
+        return pd.DataFrame(rows)
+
+
+def _code_hash_of(observation: Observation) -> str | None:
+    """get the hash of the code used to generate `observation`"""
 
-        return pd.json_normalize(dicts, sep=normalising_sep)
+    metadata = observation.metadata
+    if "code_hash" in metadata:
+        return metadata["code_hash"]
+    # observations recorded before code hashes were stored
+    code = metadata.get("code")
+    return code_hash(code) if code is not None else None
 
 
 class Observation(NamedTuple):
@@ -253,8 +323,20 @@ class Backend(ABC):
 
     Other methods are optional, but can be overridden to provide
     further custom behaviour.
+
+    Attributes
+    ----------
+    load_workers : int
+        The number of threads used by :meth:`load_all` to load individual
+        observations. Defaults to 1 (i.e. load serially). Larger values can
+        help when reading from high-latency storage, such as network file
+        systems. (:class:`~digital_experiments.backends.JSONBackend` reads
+        most observations from its index, and only uses these threads for
+        observations that are missing from, or newer than, the index.)
     """
 
+    load_workers: int = 1
+
     def __init__(self, root: Path):
         root.mkdir(parents=True, exist_ok=True)
         self.root = root
@@ -265,6 +347,19 @@ class Backend(ABC):
         Record an :class:`Observation <digital_experiments.core.Observation>`
         """
 
+    def record_many(self, observations: list[Observation]) -> None:
+        """
+        Record several
+        :class:`Observation <digital_experiments.core.Observation>` objects
+        at once.
+
+        By default, this calls :meth:`record` for each observation in turn.
+        Override this method to write them more efficiently.
+        """
+
+        for observation in observations:
+            self.record(observation)
+
     @abstractmethod
     def load(self, id: str) -> Observation:
         """
@@ -282,9 +377,31 @@ class Backend(ABC):
         objects currently stored in this backend, sorted by id.
         """
 
-        observations = [self.load(id) for id in self.all_ids()]
+        observations = self._load_many(self.all_ids())
         return sorted(observations, key=lambda obs: obs.id)
 
+    def _load_many(self, ids: list[str]) -> list[Observation]:
+        """load the observations with `ids`, using `load_workers` threads"""
+
+        if self.load_workers > 1 and len(ids) > 1:
+            workers = min(self.load_workers, len(ids))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self.load, ids))
+        return [self.load(id) for id in ids]
+
+    def load_for_code(self, code_hash: str) -> list[Observation]:
+        """
+        Load all :class:`Observation <digital_experiments.core.Observation>`
+        objects that were generated by code with the given hash, sorted by id.
+
+        By default, this filters the results of :meth:`load_all`. Override
+        this method to avoid fully loading observations that don't match.
+        """
+
+        return [
+            obs for obs in self.load_all() if _code_hash_of(obs) == code_hash
+        ]
+
     def artefacts(self, id: str) -> list[Path]:
         """
         Get a list of artefacts associated with a particular observation.
@@ -296,9 +413,10 @@ class Backend(ABC):
         """
 
         dir = artefact_location(self.root, id)
-        if not dir.exists():
+        try:
+            return list(dir.iterdir())
+        except FileNotFoundError:
             return []
-        return list(dir.glob("*"))
 
 
 class Controller(ABC):
@@ -95,9 +95,14 @@ def experiment(
     """
 
     if function is None:
-        kwargs = locals()
-        kwargs.pop("function")
-        return partial(experiment, **kwargs)  # type: ignore
+        return partial(  # type: ignore
+            experiment,
+            root=root,
+            verbose=verbose,
+            backend=backend,
+            cache=cache,
+            callbacks=callbacks,
+        )
 
     if root is None:
         env_root = os.environ.get("DE_ROOT")
@@ -135,5 +140,7 @@ def experiment(
         all_callbacks,
         cache,
     )
-    update_wrapper(e, function)
+    # don't merge the function's __dict__ into the experiment's: this could
+    # otherwise overwrite attributes such as `backend`
+    update_wrapper(e, function, updated=())
     return e
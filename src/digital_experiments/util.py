@@ -1,12 +1,25 @@
+import functools
+import hashlib
 import inspect
+import os
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict
+from types import CodeType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 
 
 def complete_config(func, args, kwargs) -> Dict[str, Any]:
     """get the complete config (including defaults) for a function"""
 
-    signature = inspect.signature(func)
+    return bind_config(inspect.signature(func), args, kwargs)
+
+
+def bind_config(signature: inspect.Signature, args, kwargs) -> Dict[str, Any]:
+    """
+    get the complete config (including defaults) for a function with
+    the given (pre-computed) `signature`
+    """
+
     config = signature.bind(*args, **kwargs)
     config.apply_defaults()
     return dict(**config.arguments)
@@ -15,7 +28,123 @@ def complete_config(func, args, kwargs) -> Dict[str, Any]:
 def source_code(function: Callable) -> str:
     """get the source code for `function`"""
 
-    return inspect.getsource(function)
+    code = getattr(inspect.unwrap(function), "__code__", None)
+    if code is None:
+        return inspect.getsource(function)
+    try:
+        stat = os.stat(code.co_filename)
+    except OSError:
+        return inspect.getsource(function)
+    return _source_code_for(code.co_filename, stat.st_mtime_ns, code)
+
+
+@functools.lru_cache(maxsize=256)
+def _source_code_for(filename: str, mtime_ns: int, code: CodeType) -> str:
+    # code objects compare equal if e.g. they only differ by comments or
+    # default values, hence the file (and when it was last modified) is
+    # part of the cache key
+    return inspect.getsource(code)
+
+
+def flatten(
+    d: Dict[Any, Any],
+    sep: str = ".",
+    key_cache: Optional[Dict[Tuple[str, str], str]] = None,
+) -> Dict[Any, Any]:
+    """
+    flatten the nested dicts in `d`, joining nested keys with `sep`
+
+    This mirrors :func:`pandas.json_normalize`: top-level, non-dict values
+    come first, followed by the (depth-first) contents of any nested dicts.
+    Empty nested dicts are dropped.
+
+    Pass the same `key_cache` when flattening many dicts with a similar
+    structure: joined keys are then created once and shared between them.
+    """
+
+    if key_cache is None:
+        key_cache = {}
+
+    flat = {k: v for k, v in d.items() if not isinstance(v, dict)}
+
+    for key, value in d.items():
+        if not isinstance(value, dict):
+            continue
+        # walk the nested dicts without recursion: each stack entry is a
+        # prefix and a (partially consumed) iterator over that dict's items
+        stack = [(str(key), iter(value.items()))]
+        while stack:
+            prefix, items = stack[-1]
+            for k, v in items:
+                if type(k) is str:
+                    new_key = key_cache.get((prefix, k))
+                    if new_key is None:
+                        new_key = key_cache[prefix, k] = f"{prefix}{sep}{k}"
+                else:
+                    # only cache str keys: e.g. 1, 1.0 and True are
+                    # equal as keys, but not once converted to str
+                    new_key = f"{prefix}{sep}{k}"
+                if isinstance(v, dict):
+                    stack.append((new_key, iter(v.items())))
+                    break
+                flat[new_key] = v
+            else:
+                stack.pop()
+
+    return flat
+
+
+def generate_id() -> str:
+    """
+    generate a new, time-based id of the form ``YYYY-MM-DD_HH-MM-SS_ffffff``
+
+    (``isoformat`` is a good deal cheaper than the equivalent ``strftime``)
+    """
+
+    now = datetime.now().isoformat("_", "microseconds")
+    return now.replace(":", "-").replace(".", "_")
+
+
+def config_key(config: Dict[str, Any]) -> Hashable:
+    """
+    get a hashable (but not necessarily unique) key for `config`
+
+    Equal configs always have equal keys, so use these keys to narrow
+    down candidates before checking for true equality. All configs that
+    contain unhashable values (other than dicts, lists, tuples and sets)
+    share a single key.
+    """
+
+    try:
+        return _freeze(config)
+    except TypeError:
+        return _UNHASHABLE
+
+
+# a single key shared by all configs that can't be frozen
+_UNHASHABLE = object()
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    convert `value` into a hashable object, such that values that compare
+    equal are converted into objects that also compare (and hash) equal
+    """
+
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    hash(value)  # raises a TypeError for unhashable values
+    return value
+
+
+def code_hash(code: str) -> str:
+    """get a short, stable hash of `code`"""
+
+    return hashlib.blake2b(code.encode(), digest_size=8).hexdigest()
 
 
 def artefact_location(root: Path, id: str) -> Path:
@@ -1,11 +1,16 @@
+import os
+import threading
+
 import pytest
 from digital_experiments.backends import (
     _ALL_BACKENDS,
     Backend,
+    BufferedBackend,
     instantiate_backend,
     register_backend,
 )
 from digital_experiments.core import Observation
+from digital_experiments.util import code_hash
 
 
 def test_incomplete_subclassing(tmp_path):
@@ -42,3 +47,168 @@ def test_success_to_register(backend, tmp_path):
     assert loaded == observation
 
     assert backend.all_ids() == ["1"]
+
+
+def test_json_index(tmp_path):
+    """The JSON backend's index is kept in sync with individual files"""
+
+    backend = instantiate_backend("json", tmp_path)
+    for id in "abc":
+        backend.record(
+            Observation(id=id, config={"x": id}, result=1, metadata={})
+        )
+    assert (tmp_path / "index.jsonl").exists()
+    assert [obs.id for obs in backend.load_all()] == ["a", "b", "c"]
+
+    # simulate manual deletion and addition of observations
+    (tmp_path / "a.json").unlink()
+    (tmp_path / "d.json").write_text(
+        (tmp_path / "c.json").read_text().replace('"c"', '"d"')
+    )
+    assert [obs.id for obs in backend.load_all()] == ["b", "c", "d"]
+    assert len((tmp_path / "index.jsonl").read_text().splitlines()) == 3
+
+    # simulate a manual edit of an existing observation
+    edited = (
+        (tmp_path / "b.json").read_text().replace('"result": 1', '"result": 2')
+    )
+    (tmp_path / "b.json").write_text(edited)
+    index_mtime = (tmp_path / "index.jsonl").stat().st_mtime_ns
+    os.utime(tmp_path / "b.json", ns=(index_mtime + 10**9, index_mtime + 10**9))
+    assert backend.load("b").result == 2
+    assert [obs.result for obs in backend.load_all()] == [2, 1, 1]
+
+
+def test_json_read_only(tmp_path, monkeypatch):
+    """Observations can still be loaded when the index can't be written"""
+
+    backend = instantiate_backend("json", tmp_path)
+    backend.record(Observation(id="a", config={}, result=1, metadata={}))
+    (tmp_path / "index.jsonl").unlink()
+
+    def read_only(observations):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(backend, "_write_index", read_only)
+    assert [obs.id for obs in backend.load_all()] == ["a"]
+
+
+def test_json_non_finite_values(tmp_path):
+    """NaN and infinite results survive a round trip through JSON"""
+
+    backend = instantiate_backend("json", tmp_path)
+    result = [float("nan"), float("inf")]
+    backend.record(Observation(id="1", config={}, result=result, metadata={}))
+
+    loaded = backend.load("1").result
+    assert loaded[0] != loaded[0] and loaded[1] == float("inf")
+    assert backend.load_all()[0].result[1] == float("inf")
+
+
+def test_json_big_integers(tmp_path):
+    """Integers that don't fit into 64 bits survive a round trip"""
+
+    backend = instantiate_backend("json", tmp_path)
+    config = {"seed": 2**70}
+    backend.record(
+        Observation(id="1", config=config, result=-(2**80), metadata={})
+    )
+
+    for loaded in (backend.load("1"), backend.load_all()[0]):
+        assert loaded.config == config and type(loaded.config["seed"]) is int
+        assert loaded.result == -(2**80) and type(loaded.result) is int
+
+
+def test_buffered_backend(tmp_path):
+    inner = instantiate_backend("json", tmp_path)
+    backend = BufferedBackend(inner, max_size=3, interval=60)
+
+    def record(id):
+        observation = Observation(id=id, config={}, result=1, metadata={})
+        backend.record(observation)
+
+    record("1")
+    record("2")
+    assert inner.all_ids() == [], "observations should be buffered"
+
+    record("3")
+    assert len(inner.all_ids()) == 3, "a full buffer should be flushed"
+
+    record("4")
+    assert [obs.id for obs in backend.load_all()] == ["1", "2", "3", "4"]
+
+
+def test_buffered_backend_failures(tmp_path):
+    inner = instantiate_backend("pickle", tmp_path)
+    backend = BufferedBackend(inner, max_size=10, interval=60)
+    backend.record(Observation(id="1", config={}, result=1, metadata={}))
+
+    def fail(observations):
+        raise OSError("disk full")
+
+    inner.record_many = fail
+    with pytest.raises(OSError):
+        backend.flush()
+
+    del inner.record_many
+    backend.flush()
+    assert inner.all_ids() == ["1"], "failed writes should be retried"
+
+    # buffered observations are flushed when the backend is garbage collected
+    backend.record(Observation(id="2", config={}, result=1, metadata={}))
+    del backend
+    assert sorted(inner.all_ids()) == ["1", "2"]
+
+
+def test_parallel_load_all(tmp_path):
+    backend = instantiate_backend("pickle", tmp_path)
+    for id in range(10):
+        backend.record(
+            Observation(id=f"{id:02}", config={}, result=id, metadata={})
+        )
+    serial = backend.load_all()
+
+    backend.load_workers = 4
+    assert backend.load_all() == serial
+
+
+def test_parallel_json_repair(tmp_path):
+    backend = instantiate_backend("json", tmp_path)
+    for id in range(10):
+        backend.record(
+            Observation(id=f"{id:02}", config={}, result=id, metadata={})
+        )
+    (tmp_path / "index.jsonl").unlink()
+
+    threads = set()
+    load = backend.load
+
+    def tracked_load(id):
+        threads.add(threading.get_ident())
+        return load(id)
+
+    backend.load = tracked_load
+    backend.load_workers = 4
+    assert [obs.result for obs in backend.load_all()] == list(range(10))
+    assert threading.get_ident() not in threads, "should load in a pool"
+
+
+@pytest.mark.parametrize("backend", _ALL_BACKENDS.keys())
+def test_load_for_code(backend, tmp_path):
+    backend = instantiate_backend(backend, tmp_path)
+    code = "def f(): pass"
+    metadatas = {
+        "current": {"code": code, "code_hash": code_hash(code)},
+        "legacy": {"code": code},
+        "other": {"code": "other", "code_hash": code_hash("other")},
+    }
+    for id, metadata in metadatas.items():
+        backend.record(Observation(id, config={}, result=1, metadata=metadata))
+
+    loaded = backend.load_for_code(code_hash(code))
+    assert [obs.id for obs in loaded] == ["current", "legacy"]
+
+    # remove the current observation's file behind the backend's back
+    next(tmp_path.glob("current.*")).unlink()
+    loaded = backend.load_for_code(code_hash(code))
+    assert [obs.id for obs in loaded] == ["legacy"]
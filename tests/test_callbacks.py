@@ -1,3 +1,7 @@
+import contextvars
+import threading
+import time
+
 import pytest
 from digital_experiments.callbacks import (
     CodeVersioning,
@@ -10,6 +14,7 @@ from digital_experiments.callbacks import (
     time_block,
 )
 from digital_experiments.core import Observation
+from digital_experiments.util import code_hash
 
 
 def test_global_state(tmp_path):
@@ -45,6 +50,7 @@ def test_code_versioning():
     obs = Observation(id="1", config={}, result=1, metadata={})
     callback.end(obs)
     assert obs.metadata["code"] == code
+    assert obs.metadata["code_hash"] == code_hash(code)
 
 
 def test_logging(capsys):
@@ -122,3 +128,84 @@ def test_save_logs(tmp_path, capsys):
     print("other text")
     captured = capsys.readouterr()
     assert "other text" in captured.out
+
+
+def test_global_state_is_thread_local(tmp_path):
+    seen = {}
+
+    def run(id):
+        callback = GlobalStateNotifier(tmp_path)
+        callback.start(id, {})
+        barrier.wait()
+        seen[id] = current_id()
+        callback.end(Observation(id=id, config={}, result=1, metadata={}))
+
+    barrier = threading.Barrier(2)
+    threads = [threading.Thread(target=run, args=(id,)) for id in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"a": "a", "b": "b"}
+
+
+def test_global_state_in_child_threads(tmp_path):
+    callback = GlobalStateNotifier(tmp_path)
+    callback.start("parent", {})
+
+    seen = {}
+
+    def run(name):
+        try:
+            seen[name] = current_id()
+        except RuntimeError:
+            seen[name] = None
+
+    # new threads start with an empty context...
+    thread = threading.Thread(target=run, args=("plain",))
+    thread.start()
+    thread.join()
+
+    # ...unless they are explicitly run in a copy of the current one
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(run, "copied"))
+    thread.start()
+    thread.join()
+
+    callback.end(Observation(id="parent", config={}, result=1, metadata={}))
+    assert seen == {"plain": None, "copied": "parent"}
+
+
+def test_concurrent_timing():
+    timing = Timing()
+    slow_started, fast_finished = threading.Event(), threading.Event()
+    observations = {}
+
+    def slow():
+        timing.start("slow", {})
+        slow_started.set()
+        fast_finished.wait()
+        observation = Observation(id="slow", config={}, result=1, metadata={})
+        timing.end(observation)
+        observations["slow"] = observation
+
+    def fast():
+        slow_started.wait()
+        time.sleep(0.1)
+        timing.start("fast", {})
+        observation = Observation(id="fast", config={}, result=1, metadata={})
+        timing.end(observation)
+        observations["fast"] = observation
+        fast_finished.set()
+
+    threads = [threading.Thread(target=slow), threading.Thread(target=fast)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the slow run started first, and so must have been timed from its
+    # own start, rather than that of the fast run
+    assert observations["slow"].metadata["timing"]["duration"] >= 0.1
+    assert observations["fast"].metadata["timing"]["duration"] < 0.1
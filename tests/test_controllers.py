@@ -1,6 +1,11 @@
 import pytest
 from digital_experiments import experiment
-from digital_experiments.controllers import Controller, GridSearch, RandomSearch
+from digital_experiments.controllers import (
+    Controller,
+    GridSearch,
+    LatinHypercubeSearch,
+    RandomSearch,
+)
 
 
 def test_random_search(tmp_path):
@@ -60,3 +65,42 @@ def test_grid_search(tmp_path):
 
     with pytest.raises(TypeError):
         controller = GridSearch(a=1)  # type: ignore
+
+
+def test_latin_hypercube_search(tmp_path):
+    class Identity:
+        def ppf(self, q):
+            return q
+
+    controller = LatinHypercubeSearch(5, a=[1, 2, 3, 4, 5], b=Identity())
+    batch = [controller.suggest(None) for _ in range(5)]  # type: ignore
+
+    # each batch uses every interval of every dimension exactly once
+    assert sorted(config["a"] for config in batch) == [1, 2, 3, 4, 5]
+    assert sorted(int(config["b"] * 5) for config in batch) == [0, 1, 2, 3, 4]
+
+    @experiment(root=tmp_path)
+    def example(a, b):
+        return a * b
+
+    controller.control(example, n=7)
+    assert len(example.observations()) == 7
+
+    with pytest.raises(TypeError):
+        LatinHypercubeSearch(5, a=1)  # type: ignore
+
+    with pytest.raises(ValueError):
+        LatinHypercubeSearch(0, a=[1, 2])
+
+
+def test_grid_search_equal_values(tmp_path):
+    @experiment(root=tmp_path)
+    def example(a):
+        return a
+
+    example(1.0)
+    controller = GridSearch(a=[1, 2])
+    assert controller.suggest(example) == {"a": 2}, "1 == 1.0 has been tried"
+
+    controller = GridSearch(a=[{(1, 2): 3}])
+    assert controller.suggest(example) == {"a": {(1, 2): 3}}
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 
 import pytest
-from digital_experiments import current_dir, experiment
+from digital_experiments import Callback, current_dir, experiment
 from digital_experiments.backends import _ALL_BACKENDS
 
 
@@ -31,6 +31,53 @@ def test_caching(tmp_path):
     assert len(observations) == 1, "there should be one observation"
 
 
+def test_caching_equal_configs(tmp_path):
+    calls = []
+
+    @experiment(root=tmp_path, cache=True)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(1)
+    identity(1.0)
+    identity(True)
+    assert len(calls) == 1, "equal configs should hit the cache"
+
+    identity({(1, 2): 3})
+    identity({(1, 2): 3})
+    assert len(calls) == 2, "dicts with tuple keys should be cached"
+
+
+@pytest.mark.parametrize("backend", _ALL_BACKENDS)
+def test_caching_deleted_observations(backend: str, tmp_path):
+    calls = []
+
+    @experiment(root=tmp_path, backend=backend, cache=True)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(1)
+    for path in tmp_path.glob(f"{identity.observations()[0].id}.*"):
+        path.unlink()
+
+    assert identity(1) == 1
+    assert len(calls) == 2, "deleted observations should be re-run"
+    assert identity(1) == 1
+    assert len(calls) == 2, "the re-run should be cached"
+
+
+def test_cached_results_are_not_shared(tmp_path):
+    @experiment(root=tmp_path, cache=True)
+    def as_list(x):
+        return [x]
+
+    result = as_list(1)
+    result.append("x")
+    assert as_list(1) == [1], "cached results should come from the backend"
+
+
 def test_root():
     os.environ["DE_ROOT"] = "test-loc"
 
@@ -79,3 +126,98 @@ def test_to_dataframe(tmp_path):
     assert df.iloc[0]["config.a"] == 1
     assert df.iloc[0]["config.b"] == 2
     assert df.iloc[0].result == 3
+
+
+def test_caching_does_not_reload(tmp_path):
+    @experiment(root=tmp_path, cache=True)
+    def square(x):
+        return x**2
+
+    assert square(2) == 4
+
+    def fail(*args):
+        raise AssertionError("cached calls should not reload observations")
+
+    square.backend.load_all = fail
+    square.backend.load_for_code = fail
+    assert square(2) == 4, "cached result should be returned"
+    assert square(3) == 9, "new configs should still be run"
+    assert square(3) == 9, "new results should be cached"
+
+
+def test_changing_callbacks(tmp_path):
+    events = []
+
+    class Recorder(Callback):
+        def start(self, id, config):
+            events.append("start")
+
+        def end(self, observation):
+            events.append("end")
+
+    @experiment(root=tmp_path)
+    def square(x):
+        return x**2
+
+    with pytest.raises(AttributeError):
+        square.callbacks.append(Recorder())  # type: ignore
+
+    square.callbacks = [*square.callbacks, Recorder()]
+    square(2)
+    assert events == ["start", "end"]
+
+
+def test_function_attributes_are_not_copied(tmp_path):
+    def square(x):
+        return x**2
+
+    square.backend = "not a backend"
+    wrapped = experiment(root=tmp_path)(square)
+
+    assert wrapped.__name__ == "square"
+    assert wrapped.__wrapped__ is square
+    assert wrapped(2) == 4, "the experiment's own attributes should be kept"
+
+
+def test_observations_are_fresh(tmp_path):
+    @experiment(root=tmp_path)
+    def square(x):
+        return x**2
+
+    square(2)
+    square.observations()[0].metadata.clear()
+    assert square.observations()[0].metadata, "observations aren't shared"
+
+    # simulate another process editing an existing observation
+    other = square.observations()[0]
+    square.backend.record(other._replace(result="edited"))
+    assert square.observations()[0].result == "edited"
+
+
+def test_observations_without_code_hash(tmp_path):
+    @experiment(root=tmp_path)
+    def square(x):
+        return x**2
+
+    square(2)
+    legacy = square.observations()[0]
+    del legacy.metadata["code_hash"]
+    square.backend.record(legacy._replace(id="legacy"))
+
+    assert len(square.observations()) == 2, "legacy observations are kept"
+
+
+def test_to_dataframe_matches_json_normalize(tmp_path):
+    pd = pytest.importorskip("pandas")
+
+    @experiment(root=tmp_path)
+    def example(a, b=None):
+        return {"sum": a, "nested": {"value": [a]}}
+
+    example(1, b={"c": 2, "d": {}})
+    example(2)
+
+    dicts = [obs._asdict() for obs in example.observations()]
+    expected = pd.json_normalize(dicts, sep=".")
+    df = example.to_dataframe(include_metadata=True)
+    pd.testing.assert_frame_equal(df, expected)
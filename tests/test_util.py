@@ -1,4 +1,19 @@
-from digital_experiments.util import complete_config, source_code
+import importlib.util
+import inspect
+import os
+import runpy
+from datetime import datetime
+
+import pytest
+from digital_experiments.util import (
+    bind_config,
+    code_hash,
+    complete_config,
+    config_key,
+    flatten,
+    generate_id,
+    source_code,
+)
 
 
 def my_func(a):
@@ -10,9 +25,94 @@ def test_get_code():
     assert code == "def my_func(a):\n    return a + 1\n"
 
 
+def test_get_code_per_file(tmp_path):
+    functions = []
+    for version in "AB":
+        path = tmp_path / f"module_{version}.py"
+        path.write_text(f"def f(x):\n    return x  # version {version}\n")
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)  # type: ignore
+        spec.loader.exec_module(module)  # type: ignore
+        functions.append(module.f)
+
+    a, b = functions
+    assert a.__code__ == b.__code__, "code objects ignore comments"
+    assert "version A" in source_code(a)
+    assert "version B" in source_code(b)
+
+    namespace = {}
+    exec("def no_source(a):\n    return a + 1\n", namespace)
+    with pytest.raises(OSError):
+        source_code(namespace["no_source"])
+
+
+def test_get_code_after_edit(tmp_path):
+    # e.g. re-running an edited script with runpy or IPython's %run
+    path = tmp_path / "script.py"
+    sources = []
+    for i, lr in enumerate(["0.1", "0.2"]):
+        path.write_text(f"def train(lr={lr}):\n    return lr\n")
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+        train = runpy.run_path(str(path))["train"]
+        sources.append(source_code(train))
+
+    assert "lr=0.1" in sources[0]
+    assert "lr=0.2" in sources[1]
+
+
 def test_complete_config():
     def my_func(a, b=1):
         return a + b
 
     config = complete_config(my_func, (1,), {})
     assert config == {"a": 1, "b": 1}
+
+    signature = inspect.signature(my_func)
+    assert bind_config(signature, (), {"a": 2}) == {"a": 2, "b": 1}
+
+
+def test_code_hash():
+    code = source_code(my_func)
+    assert code_hash(code) == code_hash(code)
+    assert code_hash(code) != code_hash(code + "\n")
+
+
+def test_flatten():
+    d = {"a": {"b": 1, "c": {"d": 2}, "e": {}}, "f": [{"g": 3}], 4: 5}
+    flat = flatten(d, sep="/")
+    assert flat == {"f": [{"g": 3}], 4: 5, "a/b": 1, "a/c/d": 2}
+    assert list(flat) == ["f", 4, "a/b", "a/c/d"], "top-level values first"
+
+    key_cache = {}
+    first = flatten({"a": {"b": 1}}, key_cache=key_cache)
+    second = flatten({"a": {"b": 2}}, key_cache=key_cache)
+    assert list(first)[0] is list(second)[0], "keys should be shared"
+
+    flatten({"config": {1: "a"}}, key_cache=key_cache)
+    flat = flatten({"config": {True: "b"}}, key_cache=key_cache)
+    assert flat == {"config.True": "b"}, "equal keys needn't share a name"
+
+
+def test_generate_id():
+    id = generate_id()
+    assert datetime.strptime(id, "%Y-%m-%d_%H-%M-%S_%f")
+
+
+def test_config_key():
+    assert config_key({"a": 1, "b": {"c": 2}}) == config_key(
+        {"b": {"c": 2}, "a": 1}
+    ), "key order should not matter"
+    assert config_key({"a": 1}) != config_key({"a": 2})
+    assert (
+        config_key({"a": 1})
+        == config_key({"a": 1.0})
+        == config_key({"a": True})
+    ), "equal configs should have equal keys"
+    assert config_key({"a": [1, {"b": 2}]}) == config_key({"a": [1, {"b": 2}]})
+    hash(config_key({"a": {(1, 2): 3}}))
+
+    # configs with unhashable values share a key
+    class Unhashable:
+        __hash__ = None
+
+    assert config_key({"a": Unhashable()}) == config_key({"b": Unhashable()})